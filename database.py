@@ -1,50 +1,372 @@
 """
 Database module for MCP Banking Server.
 Handles SQLite database connections, schema creation, and CRUD operations.
+All monetary amounts are stored and returned as integer cents.
 """
 
 import sqlite3
 import secrets
-import string
-from datetime import datetime, timedelta
+import queue
+import threading
+import hashlib
+import hmac
+import time
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
-import json
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 import os
 
+import orjson
+from cachetools import TTLCache
+
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(__file__), "bank.db")
 
+# Reader pool bounds (override with DB_POOL_MIN / DB_POOL_MAX). Writes
+# always go through a single dedicated writer connection.
+DB_POOL_MIN = int(os.environ.get("DB_POOL_MIN", "2"))
+DB_POOL_MAX = max(int(os.environ.get("DB_POOL_MAX", "10")), DB_POOL_MIN, 1)
+
+# Seconds to wait for a free connection before giving up
+DB_POOL_TIMEOUT = 30
+
+# Seconds SQLite retries a locked database (e.g. another process writing,
+# or a checkpoint) before raising "database is locked"
+DB_BUSY_TIMEOUT = 30
+
+# Prepared statements kept per pooled connection (keyed by SQL text)
+DB_STATEMENT_CACHE_SIZE = 512
+
+# Applied to every pooled connection. WAL lets readers run while a writer
+# commits; synchronous=NORMAL only fsyncs at checkpoints in WAL mode.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Version tag embedded in every API key
+API_KEY_PREFIX = "bank_v1"
+
+# Columns returned to callers; is_active is implied by every lookup
+ACCOUNT_COLUMNS = "id, account_number, holder_name, balance, created_at"
+TRANSACTION_COLUMNS = "id, account_id, type, amount, balance_after, description, created_at"
+
+# Tries at drawing an unused account number before giving up
+ACCOUNT_NUMBER_ATTEMPTS = 5
+
+# Seconds an idempotency key replays its original result
+IDEMPOTENCY_TTL = 24 * 60 * 60
+
+# Seconds a successful API key validation is remembered
+API_KEY_CACHE_TTL = 120
+
 # Default API key (generated at startup)
 DEFAULT_API_KEY: Optional[str] = None
 
+# HMAC secret for signing API keys (API_KEY_SECRET env var or stored in the DB)
+_API_KEY_SECRET: Optional[bytes] = None
+
+# Upgrades for databases created by earlier versions. Entry N moves a
+# database from user_version N to N + 1.
+_MIGRATIONS = (
+    # v1: API keys became signed tokens; unsigned legacy keys are discarded.
+    # Legacy replay rows cached whole responses rather than transactions.
+    """
+    DELETE FROM idempotency_keys;
+    DROP TABLE IF EXISTS api_keys;
+    CREATE TABLE api_keys (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyid TEXT UNIQUE NOT NULL,
+        nonce TEXT NOT NULL,
+        name TEXT NOT NULL,
+        is_active BOOLEAN DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    # v2: idx_txn_acct_created covers account_id lookups on its own
+    "DROP INDEX IF EXISTS idx_transactions_account;",
+    # v3: idempotency expiry stored as unix seconds instead of ISO text
+    "UPDATE idempotency_keys SET expires_at = CAST(strftime('%s', expires_at, 'utc') AS INTEGER);",
+    # v4: key lookup tables rebuilt as WITHOUT ROWID, clustered on their key
+    """
+    CREATE TABLE api_keys_v4 (
+        keyid TEXT PRIMARY KEY,
+        nonce TEXT NOT NULL,
+        name TEXT NOT NULL,
+        is_active BOOLEAN DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) WITHOUT ROWID;
+    INSERT INTO api_keys_v4 (keyid, nonce, name, is_active, created_at)
+        SELECT keyid, nonce, name, is_active, created_at FROM api_keys;
+    DROP TABLE api_keys;
+    ALTER TABLE api_keys_v4 RENAME TO api_keys;
+    
+    CREATE TABLE idempotency_keys_v4 (
+        key TEXT PRIMARY KEY,
+        response TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    INSERT INTO idempotency_keys_v4 (key, response, created_at, expires_at)
+        SELECT key, response, created_at, expires_at FROM idempotency_keys;
+    DROP TABLE idempotency_keys;
+    ALTER TABLE idempotency_keys_v4 RENAME TO idempotency_keys;
+    """,
+    # v5: track when each API key was last used
+    "ALTER TABLE api_keys ADD COLUMN last_used INTEGER;",
+    # v6: money stored as integer cents instead of REAL dollars
+    """
+    CREATE TABLE accounts_v6 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account_number TEXT UNIQUE NOT NULL,
+        holder_name TEXT NOT NULL,
+        balance INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_active BOOLEAN DEFAULT 1
+    );
+    INSERT INTO accounts_v6 (id, account_number, holder_name, balance, created_at, is_active)
+        SELECT id, account_number, holder_name, CAST(ROUND(balance * 100) AS INTEGER),
+               created_at, is_active
+        FROM accounts;
+    DROP TABLE accounts;
+    ALTER TABLE accounts_v6 RENAME TO accounts;
+    
+    CREATE TABLE transactions_v6 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        amount INTEGER NOT NULL,
+        balance_after INTEGER NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (account_id) REFERENCES accounts (id)
+    );
+    INSERT INTO transactions_v6 (id, account_id, type, amount, balance_after, description, created_at)
+        SELECT id, account_id, type, CAST(ROUND(amount * 100) AS INTEGER),
+               CAST(ROUND(balance_after * 100) AS INTEGER), description, created_at
+        FROM transactions;
+    DROP TABLE transactions;
+    ALTER TABLE transactions_v6 RENAME TO transactions;
+    
+    UPDATE idempotency_keys SET response = json_set(
+        response,
+        '$.amount', CAST(ROUND(json_extract(response, '$.amount') * 100) AS INTEGER),
+        '$.balance_after', CAST(ROUND(json_extract(response, '$.balance_after') * 100) AS INTEGER)
+    ) WHERE response != '';
+    """,
+    # v7: idx_txn_acct_created gains id as a tie-breaker for keyset paging
+    "DROP INDEX IF EXISTS idx_txn_acct_created;",
+)
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of open SQLite connections.
+    
+    Opens `min_size` connections up front and grows on demand up to
+    `max_size`; callers block when every connection is checked out.
+    A read_only pool sets query_only on its connections.
+    """
+    
+    def __init__(self, path: str, min_size: int, max_size: int, read_only: bool = False):
+        self.path = path
+        self.max_size = max_size
+        self.read_only = read_only
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._closed = False
+        
+        for _ in range(min(min_size, max_size)):
+            self._idle.put(self._open())
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection configured for pooled use."""
+        conn = sqlite3.connect(
+            self.path,
+            timeout=DB_BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if self.read_only:
+            conn.execute("PRAGMA query_only=ON")
+        self._size += 1
+        return conn
+    
+    def get(self, timeout: float = DB_POOL_TIMEOUT) -> sqlite3.Connection:
+        """Check out a connection, opening a new one if below max_size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if self._size < self.max_size:
+                return self._open()
+        
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out after {timeout}s waiting for a database connection"
+            )
+    
+    def put(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, discarding any open transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+    
+    def close(self) -> None:
+        """Close all idle connections; busy ones are closed when returned."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            # Refresh planner statistics before the connection goes away;
+            # that writes, so only the writer can do it
+            if not self.read_only:
+                conn.execute("PRAGMA optimize")
+            conn.close()
+
+
+# Recently validated API keys, keyed by a salted digest so raw keys are
+# never kept in memory
+_API_KEY_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=API_KEY_CACHE_TTL)
+_API_KEY_CACHE_LOCK = threading.Lock()
+_API_KEY_CACHE_SALT = secrets.token_bytes(16)
+
+# keyid -> unix time of last successful use, persisted by flush_api_key_usage()
+_API_KEY_LAST_USED: Dict[str, int] = {}
+
+# One writer connection plus a pool of readers. Writers queue for the
+# writer in-process instead of contending for SQLite's write lock.
+_POOL: Optional[ConnectionPool] = None
+_WRITER_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool(write: bool = False) -> ConnectionPool:
+    """Return the shared writer or reader pool, creating both on first use."""
+    global _POOL, _WRITER_POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                # Writer first, so it is the one to switch a new file to WAL
+                _WRITER_POOL = ConnectionPool(DB_PATH, 1, 1)
+                _POOL = ConnectionPool(DB_PATH, DB_POOL_MIN, DB_POOL_MAX, read_only=True)
+    return _WRITER_POOL if write else _POOL
+
+
+def close_pool() -> None:
+    """Close every pooled connection (called on server shutdown)."""
+    global _POOL, _WRITER_POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _WRITER_POOL.close()
+            _POOL = _WRITER_POOL = None
+
 
 @contextmanager
-def get_db_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+def get_db_connection(write: bool = False):
+    """
+    Context manager that borrows a connection from the pool.
+    
+    Pass write=True for anything that modifies the database; that borrows
+    the single writer connection, so concurrent writers wait their turn
+    here rather than failing on SQLite's lock.
+    """
+    pool = _get_pool(write)
+    conn = pool.get()
     try:
         yield conn
     finally:
-        conn.close()
+        pool.put(conn)
 
 
 def generate_account_number() -> str:
-    """Generate a unique 10-digit account number."""
-    return ''.join(secrets.choice(string.digits) for _ in range(10))
+    """Generate a random 10-digit account number."""
+    return f"{secrets.randbelow(10_000_000_000):010d}"
+
+
+def _api_key_secret() -> bytes:
+    """Get the API key signing secret."""
+    if _API_KEY_SECRET is None:
+        init_database()
+    return _API_KEY_SECRET
+
+
+def _sign_api_key(keyid: str, nonce: str) -> str:
+    """Build the signed API key for a key id and nonce."""
+    payload = f"{API_KEY_PREFIX}_{keyid}_{nonce}"
+    mac = hmac.new(_api_key_secret(), payload.encode(), hashlib.sha256).hexdigest()
+    return f"{payload}_{mac}"
+
+
+def _api_key_parts(key: str) -> Optional[Tuple[str, str]]:
+    """
+    Split an API key into (keyid, nonce) if its signature is valid.
+    
+    Runs entirely in memory, so malformed or forged keys are rejected
+    without touching the database.
+    """
+    parts = key.split("_")
+    if len(parts) != 5 or f"{parts[0]}_{parts[1]}" != API_KEY_PREFIX:
+        return None
+    
+    keyid, nonce = parts[2], parts[3]
+    expected = _sign_api_key(keyid, nonce)
+    if not hmac.compare_digest(expected.encode(), key.encode()):
+        return None
+    return keyid, nonce
 
 
 def generate_api_key() -> str:
-    """Generate a secure API key."""
-    return f"bank_{secrets.token_urlsafe(32)}"
+    """Generate a signed API key: bank_v1_<keyid>_<nonce>_<hmac>."""
+    return _sign_api_key(secrets.token_hex(8), secrets.token_hex(8))
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Bring an existing database up to SCHEMA_VERSION."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    is_new = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'accounts'"
+    ).fetchone() is None
+    
+    # Fresh databases get the current schema straight from init_database()
+    if not is_new and version < SCHEMA_VERSION:
+        # Table rebuilds drop tables that others reference
+        conn.execute("PRAGMA foreign_keys=OFF")
+        try:
+            for target in range(version, SCHEMA_VERSION):
+                conn.executescript(
+                    f"BEGIN; {_MIGRATIONS[target]} "
+                    f"PRAGMA user_version = {target + 1}; COMMIT;"
+                )
+        finally:
+            conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
 def init_database():
     """Initialize the database with all required tables."""
-    global DEFAULT_API_KEY
+    global DEFAULT_API_KEY, _API_KEY_SECRET
     
-    with get_db_connection() as conn:
+    with get_db_connection(write=True) as conn:
+        _migrate(conn)
         cursor = conn.cursor()
         
         # Create accounts table
@@ -53,7 +375,7 @@ def init_database():
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 account_number TEXT UNIQUE NOT NULL,
                 holder_name TEXT NOT NULL,
-                balance REAL DEFAULT 0.0,
+                balance INTEGER DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 is_active BOOLEAN DEFAULT 1
             )
@@ -65,8 +387,8 @@ def init_database():
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 account_id INTEGER NOT NULL,
                 type TEXT NOT NULL,
-                amount REAL NOT NULL,
-                balance_after REAL NOT NULL,
+                amount INTEGER NOT NULL,
+                balance_after INTEGER NOT NULL,
                 description TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (account_id) REFERENCES accounts (id)
@@ -76,44 +398,67 @@ def init_database():
         # Create idempotency_keys table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS idempotency_keys (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT UNIQUE NOT NULL,
+                key TEXT PRIMARY KEY,
                 response TEXT NOT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP NOT NULL
-            )
+                expires_at INTEGER NOT NULL
+            ) WITHOUT ROWID
         """)
         
         # Create api_keys table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS api_keys (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT UNIQUE NOT NULL,
+                keyid TEXT PRIMARY KEY,
+                nonce TEXT NOT NULL,
                 name TEXT NOT NULL,
                 is_active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_used INTEGER
+            ) WITHOUT ROWID
+        """)
+        
+        # Create settings table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS settings (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
             )
         """)
         
         # Create index for faster lookups
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_account_number ON accounts(account_number)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions(account_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_idempotency_key ON idempotency_keys(key)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_api_key ON api_keys(key)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_txn_acct_created "
+            "ON transactions(account_id, created_at DESC, id DESC)"
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_idem_expires ON idempotency_keys(expires_at)")
         
         conn.commit()
         
+        # Load the signing secret, generating one on first run
+        secret = os.environ.get("API_KEY_SECRET")
+        if not secret:
+            cursor.execute(
+                "INSERT OR IGNORE INTO settings (name, value) VALUES ('api_key_secret', ?)",
+                (secrets.token_hex(32),)
+            )
+            conn.commit()
+            cursor.execute("SELECT value FROM settings WHERE name = 'api_key_secret'")
+            secret = cursor.fetchone()['value']
+        _API_KEY_SECRET = secret.encode()
+        
         # Check if default API key exists, if not create one
-        cursor.execute("SELECT key FROM api_keys WHERE name = 'default'")
+        cursor.execute("SELECT keyid, nonce FROM api_keys WHERE name = 'default'")
         result = cursor.fetchone()
         
         if result:
-            DEFAULT_API_KEY = result['key']
+            DEFAULT_API_KEY = _sign_api_key(result['keyid'], result['nonce'])
         else:
             DEFAULT_API_KEY = generate_api_key()
+            keyid, nonce = _api_key_parts(DEFAULT_API_KEY)
             cursor.execute(
-                "INSERT INTO api_keys (key, name) VALUES (?, ?)",
-                (DEFAULT_API_KEY, 'default')
+                "INSERT INTO api_keys (keyid, nonce, name) VALUES (?, ?, ?)",
+                (keyid, nonce, 'default')
             )
             conn.commit()
         
@@ -128,29 +473,31 @@ def init_database():
 
 def create_account(holder_name: str) -> Dict[str, Any]:
     """Create a new bank account."""
-    account_number = generate_account_number()
-    
-    with get_db_connection() as conn:
+    with get_db_connection(write=True) as conn:
         cursor = conn.cursor()
         
-        # Ensure unique account number
-        while True:
-            cursor.execute("SELECT id FROM accounts WHERE account_number = ?", (account_number,))
-            if not cursor.fetchone():
-                break
+        # Let the UNIQUE constraint catch account number collisions
+        for _ in range(ACCOUNT_NUMBER_ATTEMPTS):
             account_number = generate_account_number()
-        
-        cursor.execute(
-            "INSERT INTO accounts (account_number, holder_name) VALUES (?, ?)",
-            (account_number, holder_name)
-        )
+            try:
+                cursor.execute(
+                    """INSERT INTO accounts (account_number, holder_name) VALUES (?, ?) 
+                       RETURNING balance, created_at""",
+                    (account_number, holder_name)
+                )
+                row = cursor.fetchone()
+                break
+            except sqlite3.IntegrityError:
+                continue
+        else:
+            raise RuntimeError("Could not generate a unique account number")
         conn.commit()
         
         return {
             "account_number": account_number,
             "holder_name": holder_name,
-            "balance": 0.0,
-            "created_at": datetime.now().isoformat()
+            "balance": row['balance'],
+            "created_at": row['created_at']
         }
 
 
@@ -159,7 +506,7 @@ def get_account(account_number: str) -> Optional[Dict[str, Any]]:
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "SELECT * FROM accounts WHERE account_number = ? AND is_active = 1",
+            f"SELECT {ACCOUNT_COLUMNS} FROM accounts WHERE account_number = ? AND is_active = 1",
             (account_number,)
         )
         row = cursor.fetchone()
@@ -174,7 +521,7 @@ def get_account_by_id(account_id: int) -> Optional[Dict[str, Any]]:
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "SELECT * FROM accounts WHERE id = ? AND is_active = 1",
+            f"SELECT {ACCOUNT_COLUMNS} FROM accounts WHERE id = ? AND is_active = 1",
             (account_id,)
         )
         row = cursor.fetchone()
@@ -184,116 +531,204 @@ def get_account_by_id(account_id: int) -> Optional[Dict[str, Any]]:
         return None
 
 
-def update_balance(account_id: int, new_balance: float) -> bool:
-    """Update account balance."""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE accounts SET balance = ? WHERE id = ?",
-            (new_balance, account_id)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
-
+class InsufficientFundsError(Exception):
+    """Raised when a withdrawal would overdraw an account."""
+    
+    def __init__(self, balance: int):
+        super().__init__(f"Insufficient funds: balance is {balance} cents")
+        self.balance = balance
 
 
-def record_transaction(
-    account_id: int,
+def apply_delta(
+    account_number: str,
+    delta: int,
     transaction_type: str,
-    amount: float,
-    balance_after: float,
-    description: str = ""
-) -> Dict[str, Any]:
-    """Record a new transaction."""
-    with get_db_connection() as conn:
+    description: str = "",
+    idempotency_key: Optional[str] = None
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Atomically adjust an account balance and record the transaction.
+    
+    The balance update and transaction insert share one connection and
+    one IMMEDIATE transaction, so concurrent movements on the same
+    account are serialized and committed with a single fsync. The
+    overdraft check is part of the UPDATE itself, so a successful
+    movement never needs a separate SELECT.
+    
+    When an idempotency key is given it is claimed in the same
+    transaction, so a retried request can never apply twice.
+    
+    Args:
+        account_number: The account to adjust
+        delta: Signed amount in cents to add to the balance
+        transaction_type: Transaction type to record (e.g. "DEPOSIT")
+        description: Human-readable transaction description
+        idempotency_key: Optional key identifying a retried request
+    
+    Raises:
+        InsufficientFundsError: If the balance would go negative
+    
+    Returns:
+        (transaction, replayed): the recorded transaction, or the original
+        one if the idempotency key was already used; transaction is None
+        if the account doesn't exist
+    """
+    with get_db_connection(write=True) as conn:
         cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        if idempotency_key:
+            cached = _claim_idempotency_key(cursor, idempotency_key)
+            if cached is not None:
+                return cached, True
+        
+        cursor.execute(
+            """UPDATE accounts SET balance = balance + ? 
+               WHERE account_number = ? AND is_active = 1 AND balance + ? >= 0 
+               RETURNING id, balance""",
+            (delta, account_number, delta)
+        )
+        row = cursor.fetchone()
+        
+        if row is None:
+            # Either the account is missing or the update would overdraw it
+            cursor.execute(
+                "SELECT balance FROM accounts WHERE account_number = ? AND is_active = 1",
+                (account_number,)
+            )
+            account = cursor.fetchone()
+            if account is None:
+                return None, False
+            raise InsufficientFundsError(account['balance'])
+        
+        balance_after = row['balance']
         cursor.execute(
             """INSERT INTO transactions 
                (account_id, type, amount, balance_after, description) 
-               VALUES (?, ?, ?, ?, ?)""",
-            (account_id, transaction_type, amount, balance_after, description)
+               VALUES (?, ?, ?, ?, ?) 
+               RETURNING id, created_at""",
+            (row['id'], transaction_type, abs(delta), balance_after, description)
         )
-        conn.commit()
-        
-        return {
-            "id": cursor.lastrowid,
-            "account_id": account_id,
+        inserted = cursor.fetchone()
+        transaction = {
+            "id": inserted['id'],
+            "account_id": row['id'],
             "type": transaction_type,
-            "amount": amount,
+            "amount": abs(delta),
             "balance_after": balance_after,
             "description": description,
-            "created_at": datetime.now().isoformat()
+            "created_at": inserted['created_at']
         }
+        
+        if idempotency_key:
+            cursor.execute(
+                "UPDATE idempotency_keys SET response = ? WHERE key = ?",
+                (orjson.dumps(transaction).decode(), idempotency_key)
+            )
+        conn.commit()
+        
+        return transaction, False
 
 
-def get_transactions(account_id: int, limit: int = 10) -> List[Dict[str, Any]]:
-    """Get transaction history for an account."""
+def get_transactions(
+    account_id: int,
+    limit: int = 10,
+    before_ts: Optional[str] = None,
+    before_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get transaction history for an account, newest first.
+    
+    Pass the created_at and id of the last transaction already seen as
+    before_ts / before_id to fetch the next page. Paging seeks straight to
+    that position in idx_txn_acct_created, so later pages cost the same as
+    the first.
+    """
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            """SELECT * FROM transactions 
-               WHERE account_id = ? 
-               ORDER BY created_at DESC 
-               LIMIT ?""",
-            (account_id, limit)
-        )
+        if before_ts is None or before_id is None:
+            cursor.execute(
+                f"""SELECT {TRANSACTION_COLUMNS} FROM transactions 
+                   WHERE account_id = ? 
+                   ORDER BY created_at DESC, id DESC 
+                   LIMIT ?""",
+                (account_id, limit)
+            )
+        else:
+            cursor.execute(
+                f"""SELECT {TRANSACTION_COLUMNS} FROM transactions 
+                   WHERE account_id = ? AND (created_at, id) < (?, ?) 
+                   ORDER BY created_at DESC, id DESC 
+                   LIMIT ?""",
+                (account_id, before_ts, before_id, limit)
+            )
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
 
-def get_all_transactions(account_id: int) -> List[Dict[str, Any]]:
-    """Get all transactions for an account (for CSV export)."""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """SELECT * FROM transactions 
-               WHERE account_id = ? 
-               ORDER BY created_at DESC""",
-            (account_id,)
-        )
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+def get_all_transactions(
+    account_id: int,
+    batch_size: int = 1000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream all transactions for an account in batches (for CSV export).
+    
+    Each batch is one keyset page from get_transactions, so memory stays
+    flat for long histories and the pooled connection is returned before
+    every batch is handed to the caller; a slow consumer never holds one.
+    """
+    before_ts = before_id = None
+    while True:
+        batch = get_transactions(account_id, batch_size, before_ts, before_id)
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        before_ts, before_id = batch[-1]['created_at'], batch[-1]['id']
 
 
 #Idempotency Operations 
 
-def check_idempotency_key(key: str) -> Optional[Dict[str, Any]]:
-    """Check if an idempotency key exists and is not expired."""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """SELECT response FROM idempotency_keys 
-               WHERE key = ? AND expires_at > ?""",
-            (key, datetime.now().isoformat())
-        )
-        row = cursor.fetchone()
-        
-        if row:
-            return json.loads(row['response'])
-        return None
-
-
-def store_idempotency_key(key: str, response: Dict[str, Any]) -> None:
-    """Store an idempotency key with its response."""
-    expires_at = datetime.now() + timedelta(hours=24)
+def _claim_idempotency_key(
+    cursor: sqlite3.Cursor,
+    key: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Claim an idempotency key inside the caller's transaction.
     
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """INSERT OR REPLACE INTO idempotency_keys 
-               (key, response, expires_at) VALUES (?, ?, ?)""",
-            (key, json.dumps(response), expires_at.isoformat())
-        )
-        conn.commit()
+    A single upsert either inserts a placeholder row (or takes over an
+    expired one) and returns the empty placeholder, or leaves a live row
+    untouched and returns its stored transaction. The caller fills in the
+    placeholder before committing; rolling back releases the claim.
+    
+    Returns:
+        The stored transaction if the key was already used, else None
+    """
+    now = int(time.time())
+    cursor.execute(
+        """INSERT INTO idempotency_keys (key, response, expires_at) 
+           VALUES (?, '', ?) 
+           ON CONFLICT(key) DO UPDATE SET 
+               response = CASE WHEN expires_at > ? THEN response ELSE excluded.response END, 
+               expires_at = CASE WHEN expires_at > ? THEN expires_at ELSE excluded.expires_at END 
+           RETURNING response""",
+        (key, now + IDEMPOTENCY_TTL, now, now)
+    )
+    response = cursor.fetchone()['response']
+    
+    if response:
+        return orjson.loads(response)
+    return None
 
 
 def cleanup_expired_idempotency_keys() -> int:
     """Remove expired idempotency keys."""
-    with get_db_connection() as conn:
+    with get_db_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute(
             "DELETE FROM idempotency_keys WHERE expires_at < ?",
-            (datetime.now().isoformat(),)
+            (int(time.time()),)
         )
         conn.commit()
         return cursor.rowcount
@@ -301,15 +736,79 @@ def cleanup_expired_idempotency_keys() -> int:
 
 # API Key Operations 
 
+def _api_key_digest(key: str) -> str:
+    """Salted digest used as the validation cache key."""
+    return hashlib.blake2b(
+        key.encode(), key=_API_KEY_CACHE_SALT, digest_size=16
+    ).hexdigest()
+
+
+def check_api_key_cached(key: str) -> Optional[bool]:
+    """
+    Validate an API key without touching the database.
+    
+    Returns False for a bad signature, True for a key in the cache, and
+    None when only a database lookup (validate_api_key) can decide.
+    Cheap enough to call from the event loop.
+    """
+    parts = _api_key_parts(key)
+    if parts is None:
+        return False
+    
+    digest = _api_key_digest(key)
+    with _API_KEY_CACHE_LOCK:
+        if digest in _API_KEY_CACHE:
+            _API_KEY_LAST_USED[parts[0]] = int(time.time())
+            return True
+    return None
+
+
 def validate_api_key(key: str) -> bool:
-    """Validate an API key."""
+    """
+    Validate an API key.
+    
+    Keys with a bad signature are rejected before the cache or database
+    is consulted. Only successful lookups are cached, so newly created
+    keys work immediately. Usage is recorded in memory and written out
+    in batches by flush_api_key_usage().
+    """
+    cached = check_api_key_cached(key)
+    if cached is not None:
+        return cached
+    
+    parts = _api_key_parts(key)
+    digest = _api_key_digest(key)
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "SELECT id FROM api_keys WHERE key = ? AND is_active = 1",
-            (key,)
+            "SELECT 1 FROM api_keys WHERE keyid = ? AND nonce = ? AND is_active = 1",
+            parts
         )
-        return cursor.fetchone() is not None
+        valid = cursor.fetchone() is not None
+    
+    if valid:
+        with _API_KEY_CACHE_LOCK:
+            _API_KEY_CACHE[digest] = True
+            _API_KEY_LAST_USED[parts[0]] = int(time.time())
+    return valid
+
+
+def flush_api_key_usage() -> int:
+    """Write pending API key last-used times in one transaction."""
+    global _API_KEY_LAST_USED
+    with _API_KEY_CACHE_LOCK:
+        pending, _API_KEY_LAST_USED = _API_KEY_LAST_USED, {}
+    
+    if not pending:
+        return 0
+    
+    with get_db_connection(write=True) as conn:
+        conn.executemany(
+            "UPDATE api_keys SET last_used = ? WHERE keyid = ?",
+            [(used, keyid) for keyid, used in pending.items()]
+        )
+        conn.commit()
+    return len(pending)
 
 
 def get_default_api_key() -> str:
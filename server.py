@@ -11,35 +11,109 @@ A production-ready banking server built with FastMCP featuring:
 """
 
 from fastmcp import FastMCP
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
-from starlette.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse, PlainTextResponse
 from starlette.websockets import WebSocket, WebSocketDisconnect
 from typing import Optional
+from contextlib import asynccontextmanager
 import asyncio
+import base64
+import binascii
 import csv
 import io
+import math
 import os
+from decimal import Decimal
+
+import orjson
 
 DISABLE_AUTH = os.environ.get("DISABLE_AUTH", "").lower() in ("true", "1", "yes")
 
+# Transactions written per chunk of a CSV export
+CSV_BATCH_SIZE = 1000
+
+# Seconds between writes of API key last-used times
+API_KEY_USAGE_FLUSH_INTERVAL = 30
+
+# Largest amount, in dollars, accepted for a single deposit or withdrawal
+MAX_AMOUNT = 1_000_000_000
+
 from database import (
     init_database,
     create_account as db_create_account,
     get_account,
     get_account_by_id,
-    update_balance,
-    record_transaction,
+    apply_delta,
+    InsufficientFundsError,
     get_transactions,
     get_all_transactions,
-    check_idempotency_key,
-    store_idempotency_key,
     get_default_api_key,
-    validate_api_key
+    check_api_key_cached,
+    validate_api_key,
+    flush_api_key_usage,
+    close_pool
 )
 from websocket_manager import manager
 
 init_database()
 
+
+# Transactions waiting to be pushed to WebSocket subscribers. Both are set
+# while the server is running so sync code on any thread can enqueue.
+_broadcast_queue: Optional[asyncio.Queue] = None
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def queue_broadcast(account_number: str, transaction: dict) -> None:
+    """Schedule a transaction notification; safe to call from any thread."""
+    loop = _event_loop
+    if loop is None:
+        return  # Server isn't running, so there are no subscribers
+    if not manager.has_subscribers(account_number):
+        return  # Most accounts have nobody listening; skip waking the loop
+    loop.call_soon_threadsafe(
+        _broadcast_queue.put_nowait, (account_number, transaction)
+    )
+
+
+async def _drain_broadcasts(queue: asyncio.Queue) -> None:
+    """Deliver queued transaction notifications to WebSocket clients."""
+    while True:
+        account_number, transaction = await queue.get()
+        await manager.broadcast_transaction(account_number, transaction)
+
+
+async def _flush_api_key_usage_periodically() -> None:
+    """Persist API key last-used times every API_KEY_USAGE_FLUSH_INTERVAL."""
+    while True:
+        await asyncio.sleep(API_KEY_USAGE_FLUSH_INTERVAL)
+        try:
+            await run_in_threadpool(flush_api_key_usage)
+        except Exception as e:
+            print(f"Failed to record API key usage: {e}")
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Run background workers and release resources on shutdown."""
+    global _broadcast_queue, _event_loop
+    _broadcast_queue = asyncio.Queue()
+    _event_loop = asyncio.get_running_loop()
+    workers = [
+        asyncio.create_task(_drain_broadcasts(_broadcast_queue)),
+        asyncio.create_task(_flush_api_key_usage_periodically()),
+    ]
+    try:
+        yield
+    finally:
+        _event_loop = None
+        for worker in workers:
+            worker.cancel()
+        flush_api_key_usage()
+        close_pool()
+
+
 mcp = FastMCP(
     name="MCP Banking Server",
     instructions="""
@@ -53,11 +127,19 @@ mcp = FastMCP(
     - View transaction history
     
     All monetary operations support idempotency to prevent double-processing.
-    """
+    """,
+    lifespan=lifespan
 )
 
 
-def verify_api_key(request: Request) -> bool:
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson instead of the stdlib json module."""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+async def verify_api_key(request: Request) -> bool:
     """Verify API key from request headers."""
     # Skip authentication if DISABLE_AUTH is set
     if DISABLE_AUTH:
@@ -66,17 +148,56 @@ def verify_api_key(request: Request) -> bool:
     api_key = request.headers.get("X-API-Key")
     if not api_key:
         return False
-    return validate_api_key(api_key)
+    
+    # Signature and cache checks are in-memory; only a cache miss needs
+    # the database, which must not block the event loop
+    cached = check_api_key_cached(api_key)
+    if cached is not None:
+        return cached
+    return await run_in_threadpool(validate_api_key, api_key)
 
 
-def unauthorized_response(message: str = "Unauthorized") -> JSONResponse:
+def unauthorized_response(message: str = "Unauthorized") -> ORJSONResponse:
     """Return a 401 unauthorized response."""
-    return JSONResponse(
+    return ORJSONResponse(
         {"error": message, "detail": "Include valid 'X-API-Key' header"},
         status_code=401
     )
 
 
+# Money is kept in integer cents; the API speaks dollars
+
+def to_cents(amount: float) -> int:
+    """
+    Convert a dollar amount to integer cents.
+    
+    Raises ValueError for amounts that are not finite, exceed MAX_AMOUNT,
+    or have fractions of a cent, rather than silently rounding them.
+    """
+    if not math.isfinite(amount):
+        raise ValueError("Amount must be a finite number")
+    if abs(amount) > MAX_AMOUNT:
+        raise ValueError(f"Amount must not exceed ${MAX_AMOUNT:,.2f}")
+    # repr gives the shortest decimal that round-trips, e.g. 10.99 not 10.98999...
+    if Decimal(repr(amount)).as_tuple().exponent < -2:
+        raise ValueError("Amount must be in whole cents")
+    return round(amount * 100)
+
+
+def to_dollars(cents: int) -> float:
+    """Convert integer cents to a dollar amount."""
+    return cents / 100
+
+
+def transaction_to_dollars(transaction: dict) -> dict:
+    """Return a copy of a stored transaction with amounts in dollars."""
+    return {
+        **transaction,
+        "amount": to_dollars(transaction['amount']),
+        "balance_after": to_dollars(transaction['balance_after'])
+    }
+
+
 # Business Logic Functions 
 
 def do_create_account(holder_name: str) -> dict:
@@ -85,6 +206,7 @@ def do_create_account(holder_name: str) -> dict:
         return {"success": False, "error": "Holder name is required"}
     
     result = db_create_account(holder_name.strip())
+    result["balance"] = to_dollars(result["balance"])
     return {
         "success": True,
         "message": f"Account created successfully for {holder_name}",
@@ -98,46 +220,36 @@ def do_deposit(
     idempotency_key: Optional[str] = None
 ) -> dict:
     """Deposit funds into a bank account."""
-    if idempotency_key:
-        cached = check_idempotency_key(idempotency_key)
-        if cached:
-            cached["idempotent_replay"] = True
-            return cached
-    
-    if amount <= 0:
+    try:
+        cents = to_cents(amount)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    if cents <= 0:
         return {"success": False, "error": "Amount must be positive"}
     
-    account = get_account(account_number)
-    if not account:
-        return {"success": False, "error": f"Account {account_number} not found"}
-    
-    new_balance = account['balance'] + amount
-    update_balance(account['id'], new_balance)
-    
-    transaction = record_transaction(
-        account_id=account['id'],
+    transaction, replayed = apply_delta(
+        account_number,
+        cents,
         transaction_type="DEPOSIT",
-        amount=amount,
-        balance_after=new_balance,
-        description=f"Deposit of ${amount:.2f}"
+        description=f"Deposit of ${to_dollars(cents):.2f}",
+        idempotency_key=idempotency_key
     )
+    if not transaction:
+        return {"success": False, "error": f"Account {account_number} not found"}
     
+    transaction = transaction_to_dollars(transaction)
     result = {
         "success": True,
-        "message": f"Successfully deposited ${amount:.2f}",
+        "message": f"Successfully deposited ${transaction['amount']:.2f}",
         "transaction": transaction,
-        "new_balance": new_balance
+        "new_balance": transaction['balance_after']
     }
     
-    if idempotency_key:
-        store_idempotency_key(idempotency_key, result)
+    if replayed:
+        result["idempotent_replay"] = True
+        return result
     
-    try:
-        asyncio.create_task(
-            manager.broadcast_transaction(account_number, transaction)
-        )
-    except RuntimeError:
-        pass 
+    queue_broadcast(account_number, transaction)
     
     return result
 
@@ -148,54 +260,44 @@ def do_withdraw(
     idempotency_key: Optional[str] = None
 ) -> dict:
     """Withdraw funds from a bank account."""
-    # Check idempotency
-    if idempotency_key:
-        cached = check_idempotency_key(idempotency_key)
-        if cached:
-            cached["idempotent_replay"] = True
-            return cached
-    
     # Validate amount
-    if amount <= 0:
+    try:
+        cents = to_cents(amount)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    if cents <= 0:
         return {"success": False, "error": "Amount must be positive"}
     
-    account = get_account(account_number)
-    if not account:
-        return {"success": False, "error": f"Account {account_number} not found"}
-    
-    if account['balance'] < amount:
+    try:
+        transaction, replayed = apply_delta(
+            account_number,
+            -cents,
+            transaction_type="WITHDRAWAL",
+            description=f"Withdrawal of ${to_dollars(cents):.2f}",
+            idempotency_key=idempotency_key
+        )
+    except InsufficientFundsError as e:
         return {
             "success": False,
-            "error": f"Insufficient funds. Available balance: ${account['balance']:.2f}"
+            "error": f"Insufficient funds. Available balance: ${to_dollars(e.balance):.2f}"
         }
     
-    new_balance = account['balance'] - amount
-    update_balance(account['id'], new_balance)
-    
-    transaction = record_transaction(
-        account_id=account['id'],
-        transaction_type="WITHDRAWAL",
-        amount=amount,
-        balance_after=new_balance,
-        description=f"Withdrawal of ${amount:.2f}"
-    )
+    if not transaction:
+        return {"success": False, "error": f"Account {account_number} not found"}
     
+    transaction = transaction_to_dollars(transaction)
     result = {
         "success": True,
-        "message": f"Successfully withdrew ${amount:.2f}",
+        "message": f"Successfully withdrew ${transaction['amount']:.2f}",
         "transaction": transaction,
-        "new_balance": new_balance
+        "new_balance": transaction['balance_after']
     }
     
-    if idempotency_key:
-        store_idempotency_key(idempotency_key, result)
+    if replayed:
+        result["idempotent_replay"] = True
+        return result
     
-    try:
-        asyncio.create_task(
-            manager.broadcast_transaction(account_number, transaction)
-        )
-    except RuntimeError:
-        pass 
+    queue_broadcast(account_number, transaction)
     
     return result
 
@@ -206,30 +308,63 @@ def do_get_balance(account_number: str) -> dict:
     if not account:
         return {"success": False, "error": f"Account {account_number} not found"}
     
+    balance = to_dollars(account['balance'])
     return {
         "success": True,
         "account_number": account['account_number'],
         "holder_name": account['holder_name'],
-        "balance": account['balance'],
-        "formatted_balance": f"${account['balance']:.2f}"
+        "balance": balance,
+        "formatted_balance": f"${balance:.2f}"
     }
 
 
-def do_get_transaction_history(account_number: str, limit: int = 10) -> dict:
-    """Get recent transaction history for a bank account."""
+def encode_cursor(transaction: dict) -> str:
+    """Encode a transaction's (created_at, id) position as an opaque page cursor."""
+    raw = orjson.dumps([transaction['created_at'], transaction['id']])
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a page cursor back into (created_at, id); raises ValueError if malformed."""
+    try:
+        created_at, txn_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(created_at, str) or not isinstance(txn_id, int):
+        raise ValueError("Invalid cursor")
+    return created_at, txn_id
+
+
+def do_get_transaction_history(
+    account_number: str,
+    limit: int = 10,
+    before_ts: Optional[str] = None,
+    before_id: Optional[int] = None
+) -> dict:
+    """
+    Get recent transaction history for a bank account.
+    
+    before_ts / before_id are the position from a decoded page cursor;
+    callers decode it themselves so they can report a bad one their own way.
+    """
     account = get_account(account_number)
     if not account:
         return {"success": False, "error": f"Account {account_number} not found"}
     
-    transactions = get_transactions(account['id'], limit)
+    rows = get_transactions(account['id'], limit, before_ts, before_id)
+    transactions = [transaction_to_dollars(txn) for txn in rows]
+    
+    # A full page means there may be more; hand back where it stopped
+    next_cursor = encode_cursor(rows[-1]) if rows and len(rows) == limit else None
     
     return {
         "success": True,
         "account_number": account_number,
         "holder_name": account['holder_name'],
-        "current_balance": account['balance'],
+        "current_balance": to_dollars(account['balance']),
         "transaction_count": len(transactions),
-        "transactions": transactions
+        "transactions": transactions,
+        "next_cursor": next_cursor
     }
 
 
@@ -304,50 +439,65 @@ def get_balance(account_number: str) -> dict:
 
 
 @mcp.tool
-def get_transaction_history(account_number: str, limit: int = 10) -> dict:
+def get_transaction_history(
+    account_number: str,
+    limit: int = 10,
+    cursor: Optional[str] = None
+) -> dict:
     """
     Get recent transaction history for a bank account.
     
     Args:
         account_number: The 10-digit account number
         limit: Maximum number of transactions to return (default: 10)
+        cursor: Optional next_cursor from a previous call, to fetch the next page
         
     Returns:
-        List of recent transactions
+        List of recent transactions and a next_cursor for the following page
     """
-    return do_get_transaction_history(account_number, limit)
+    before_ts = before_id = None
+    if cursor:
+        try:
+            before_ts, before_id = decode_cursor(cursor)
+        except ValueError:
+            return {"success": False, "error": "Invalid cursor"}
+    return do_get_transaction_history(account_number, limit, before_ts, before_id)
 
 
 #  Custom REST API Routes 
 
+# Root endpoint payload, serialized once since none of it changes at runtime
+ROOT_PAYLOAD = orjson.dumps({
+    "name": "MCP Banking Server",
+    "version": "1.0.0",
+    "description": "A production-ready banking API with MCP integration",
+    "default_api_key": get_default_api_key(),
+    "endpoints": {
+        "accounts": "/accounts",
+        "health": "/health",
+        "mcp": "/mcp/"
+    },
+    "features": [
+        "MCP tools for LLM integration",
+        "REST API endpoints",
+        "API key authentication",
+        "Idempotency support",
+        "WebSocket live updates",
+        "CSV export"
+    ]
+})
+
+
 @mcp.custom_route("/", methods=["GET"])
-async def root(request: Request) -> JSONResponse:
+async def root(request: Request) -> Response:
     """Root endpoint with API information."""
-    return JSONResponse({
-        "name": "MCP Banking Server",
-        "version": "1.0.0",
-        "description": "A production-ready banking API with MCP integration",
-        "default_api_key": get_default_api_key(),
-        "endpoints": {
-            "accounts": "/accounts",
-            "health": "/health",
-            "mcp": "/mcp/"
-        },
-        "features": [
-            "MCP tools for LLM integration",
-            "REST API endpoints",
-            "API key authentication",
-            "Idempotency support",
-            "WebSocket live updates",
-            "CSV export"
-        ]
-    })
+    return Response(ROOT_PAYLOAD, media_type="application/json")
 
 
 @mcp.custom_route("/health", methods=["GET"])
-async def health_check(request: Request) -> JSONResponse:
+async def health_check(request: Request) -> ORJSONResponse:
     """Health check endpoint for monitoring."""
-    return JSONResponse({
+    return ORJSONResponse({
         "status": "healthy",
         "service": "MCP Banking Server",
         "version": "1.0.0",
@@ -356,46 +506,46 @@ async def health_check(request: Request) -> JSONResponse:
 
 
 @mcp.custom_route("/accounts", methods=["POST"])
-async def api_create_account(request: Request) -> JSONResponse:
+async def api_create_account(request: Request) -> ORJSONResponse:
     """Create a new bank account."""
-    if not verify_api_key(request):
+    if not await verify_api_key(request):
         return unauthorized_response()
     
     try:
         body = await request.json()
         holder_name = body.get("holder_name", "").strip()
     except:
-        return JSONResponse({"error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"error": "Invalid JSON body"}, status_code=400)
     
     if not holder_name:
-        return JSONResponse({"error": "holder_name is required"}, status_code=400)
+        return ORJSONResponse({"error": "holder_name is required"}, status_code=400)
     
-    result = do_create_account(holder_name)
+    result = await run_in_threadpool(do_create_account, holder_name)
     if not result.get("success"):
-        return JSONResponse({"error": result.get("error")}, status_code=400)
+        return ORJSONResponse({"error": result.get("error")}, status_code=400)
     
-    return JSONResponse(result, status_code=201)
+    return ORJSONResponse(result, status_code=201)
 
 
 @mcp.custom_route("/accounts/{account_number}", methods=["GET"])
-async def api_get_account(request: Request) -> JSONResponse:
+async def api_get_account(request: Request) -> ORJSONResponse:
     """Get account details."""
-    if not verify_api_key(request):
+    if not await verify_api_key(request):
         return unauthorized_response()
     
     account_number = request.path_params.get("account_number")
-    result = do_get_balance(account_number)
+    result = await run_in_threadpool(do_get_balance, account_number)
     
     if not result.get("success"):
-        return JSONResponse({"error": result.get("error")}, status_code=404)
+        return ORJSONResponse({"error": result.get("error")}, status_code=404)
     
-    return JSONResponse(result)
+    return ORJSONResponse(result)
 
 
 @mcp.custom_route("/accounts/{account_number}/deposit", methods=["POST"])
-async def api_deposit(request: Request) -> JSONResponse:
+async def api_deposit(request: Request) -> ORJSONResponse:
     """Deposit funds into an account."""
-    if not verify_api_key(request):
+    if not await verify_api_key(request):
         return unauthorized_response()
     
     account_number = request.path_params.get("account_number")
@@ -405,20 +555,20 @@ async def api_deposit(request: Request) -> JSONResponse:
         body = await request.json()
         amount = float(body.get("amount", 0))
     except:
-        return JSONResponse({"error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"error": "Invalid JSON body"}, status_code=400)
     
-    result = do_deposit(account_number, amount, idempotency_key)
+    result = await run_in_threadpool(do_deposit, account_number, amount, idempotency_key)
     
     if not result.get("success"):
-        return JSONResponse({"error": result.get("error")}, status_code=400)
+        return ORJSONResponse({"error": result.get("error")}, status_code=400)
     
-    return JSONResponse(result)
+    return ORJSONResponse(result)
 
 
 @mcp.custom_route("/accounts/{account_number}/withdraw", methods=["POST"])
-async def api_withdraw(request: Request) -> JSONResponse:
+async def api_withdraw(request: Request) -> ORJSONResponse:
     """Withdraw funds from an account."""
-    if not verify_api_key(request):
+    if not await verify_api_key(request):
         return unauthorized_response()
     
     account_number = request.path_params.get("account_number")
@@ -428,55 +578,62 @@ async def api_withdraw(request: Request) -> JSONResponse:
         body = await request.json()
         amount = float(body.get("amount", 0))
     except:
-        return JSONResponse({"error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"error": "Invalid JSON body"}, status_code=400)
     
-    result = do_withdraw(account_number, amount, idempotency_key)
+    result = await run_in_threadpool(do_withdraw, account_number, amount, idempotency_key)
     
     if not result.get("success"):
         status = 422 if "Insufficient" in result.get("error", "") else 400
-        return JSONResponse({"error": result.get("error")}, status_code=status)
+        return ORJSONResponse({"error": result.get("error")}, status_code=status)
     
-    return JSONResponse(result)
+    return ORJSONResponse(result)
 
 
 @mcp.custom_route("/accounts/{account_number}/transactions", methods=["GET"])
-async def api_get_transactions(request: Request) -> JSONResponse:
+async def api_get_transactions(request: Request) -> ORJSONResponse:
     """Get transaction history for an account."""
-    if not verify_api_key(request):
+    if not await verify_api_key(request):
         return unauthorized_response()
     
     account_number = request.path_params.get("account_number")
     limit = int(request.query_params.get("limit", 10))
     limit = min(max(limit, 1), 100)  # Clamp between 1 and 100
-    
-    result = do_get_transaction_history(account_number, limit)
+    before_ts = before_id = None
+    cursor = request.query_params.get("cursor")
+    if cursor:
+        try:
+            before_ts, before_id = decode_cursor(cursor)
+        except ValueError:
+            return ORJSONResponse({"error": "Invalid cursor"}, status_code=400)
+    
+    result = await run_in_threadpool(
+        do_get_transaction_history, account_number, limit, before_ts, before_id
+    )
     
     if not result.get("success"):
-        return JSONResponse({"error": result.get("error")}, status_code=404)
+        return ORJSONResponse({"error": result.get("error")}, status_code=404)
     
-    return JSONResponse(result)
+    return ORJSONResponse(result)
 
 
 @mcp.custom_route("/accounts/{account_number}/transactions/export", methods=["GET"])
 async def api_export_transactions(request: Request) -> StreamingResponse:
     """Export all transactions as CSV file."""
-    if not verify_api_key(request):
-        return JSONResponse(
+    if not await verify_api_key(request):
+        return ORJSONResponse(
             {"error": "Unauthorized", "detail": "Include valid 'X-API-Key' header"},
             status_code=401
         )
     
     account_number = request.path_params.get("account_number")
-    account = get_account(account_number)
+    account = await run_in_threadpool(get_account, account_number)
     
     if not account:
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": f"Account {account_number} not found"},
             status_code=404
         )
     
-    transactions = get_all_transactions(account['id'])
-    
     def generate_csv():
         output = io.StringIO()
         writer = csv.writer(output)
@@ -487,16 +644,20 @@ async def api_export_transactions(request: Request) -> StreamingResponse:
         output.seek(0)
         output.truncate()
         
-        # Write transactions
-        for txn in transactions:
-            writer.writerow([
-                txn['id'],
-                txn['type'],
-                f"${txn['amount']:.2f}",
-                f"${txn['balance_after']:.2f}",
-                txn['description'],
-                txn['created_at']
-            ])
+        # Write transactions a page at a time; each page releases its
+        # database connection before the client reads it
+        for batch in get_all_transactions(account['id'], CSV_BATCH_SIZE):
+            writer.writerows(
+                (
+                    txn['id'],
+                    txn['type'],
+                    f"${to_dollars(txn['amount']):.2f}",
+                    f"${to_dollars(txn['balance_after']):.2f}",
+                    txn['description'],
+                    txn['created_at']
+                )
+                for txn in batch
+            )
             yield output.getvalue()
             output.seek(0)
             output.truncate()
@@ -510,9 +671,9 @@ async def api_export_transactions(request: Request) -> StreamingResponse:
 
 
 @mcp.custom_route("/ws/transactions/{account_number}", methods=["GET"])
-async def websocket_upgrade_info(request: Request) -> JSONResponse:
+async def websocket_upgrade_info(request: Request) -> ORJSONResponse:
     """Info about the WebSocket endpoint."""
-    return JSONResponse({
+    return ORJSONResponse({
         "message": "This is a WebSocket endpoint",
         "usage": "Connect using WebSocket protocol (ws://)",
         "example": "ws://localhost:8000/ws/transactions/{account_number}"
@@ -533,4 +694,11 @@ if __name__ == "__main__":
         print("\n Authentication is ENABLED (use X-API-Key header)")
     
     print()
-    mcp.run(transport="http", host="0.0.0.0", port=8000)
+    # permessage-deflate would recompress every broadcast frame once per
+    # client; frames are small JSON, so they go out uncompressed and shared
+    mcp.run(
+        transport="http",
+        host="0.0.0.0",
+        port=8000,
+        uvicorn_config={"ws_per_message_deflate": False}
+    )
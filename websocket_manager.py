@@ -4,9 +4,101 @@ Handles real-time transaction notifications.
 """
 
 from fastapi import WebSocket
-from typing import Dict, List, Set
-import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import asyncio
+import contextlib
+import os
+
+import orjson
+
+# Opt-in self-check that recounts every account's clients against the
+# running total; too slow to leave on for /health
+CHECK_CONNECTION_COUNTS = os.environ.get("WS_CHECK_CONNECTION_COUNTS", "").lower() in ("true", "1", "yes")
+
+# Frames that may wait for a single client before it is treated as too slow
+CLIENT_QUEUE_SIZE = 256
+
+# Seconds a single client may take to accept a frame before it is dropped
+SEND_TIMEOUT = 5.0
+
+# Close code sent to clients dropped for falling behind or failing a
+# send (1013 = "Try Again Later"), so they know to reconnect
+DROPPED_CLIENT_CLOSE_CODE = 1013
+
+# Seconds to collect an account's transactions into one broadcast frame
+BATCH_WINDOW = 0.01
+
+# Subscribers queued per turn of the event loop during a large broadcast
+BROADCAST_BATCH_SIZE = 50
+
+# Share of an account's subscriber slots that may be tombstones before
+# the list is compacted
+COMPACT_RATIO = 0.25
+
+# Accounts whose serialized welcome frame is kept for reconnects
+WELCOME_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=WELCOME_CACHE_SIZE)
+def _welcome_frame(account_number: str) -> bytes:
+    """Serialized welcome message for an account, built once and reused."""
+    return orjson.dumps({
+        "type": "connected",
+        "message": f"Connected to transaction updates for account {account_number}",
+        "account_number": account_number
+    })
+
+
+@dataclass(slots=True)
+class ClientState:
+    """Outbound state for one connected WebSocket client."""
+    
+    websocket: WebSocket
+    account_number: str
+    queue: asyncio.Queue
+    writer: asyncio.Task
+    # Index of this client in its account's Subscribers.clients
+    slot: int = -1
+
+
+@dataclass(slots=True)
+class Subscribers:
+    """
+    The clients subscribed to one account, packed in a list for fast
+    broadcast iteration.
+    
+    Removing a client leaves a None tombstone in its slot; the list is
+    compacted once tombstones make up more than COMPACT_RATIO of it.
+    """
+    
+    clients: List[Optional[ClientState]] = field(default_factory=list)
+    live: int = 0
+    
+    def __len__(self) -> int:
+        return self.live
+    
+    def add(self, client: ClientState) -> None:
+        client.slot = len(self.clients)
+        self.clients.append(client)
+        self.live += 1
+    
+    def discard(self, client: ClientState) -> bool:
+        """Tombstone a client; returns False if it is not subscribed here."""
+        slot = client.slot
+        if not 0 <= slot < len(self.clients) or self.clients[slot] is not client:
+            return False
+        
+        self.clients[slot] = None
+        self.live -= 1
+        
+        if len(self.clients) - self.live > len(self.clients) * COMPACT_RATIO:
+            # A new list, so snapshots of the old one stay valid
+            self.clients = [c for c in self.clients if c is not None]
+            for slot, remaining in enumerate(self.clients):
+                remaining.slot = slot
+        return True
 
 
 class ConnectionManager:
@@ -14,13 +106,28 @@ class ConnectionManager:
     Manages WebSocket connections for real-time transaction updates.
     
     Supports multiple clients per account with automatic cleanup on disconnect.
+    Each client gets its own outbound queue drained by a writer task, so a
+    broadcast only enqueues and a slow client can only fall behind itself.
     """
     
+    __slots__ = ("active_connections", "_clients", "_total", "_pending", "_tasks")
+    
     def __init__(self):
-        # Map of account_number -> set of WebSocket connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-        # Lock for thread-safe operations
-        self._lock = asyncio.Lock()
+        # Map of account_number -> Subscribers.
+        # Only touched from the event loop, and never across an await, so
+        # no lock is needed.
+        self.active_connections: Dict[str, Subscribers] = {}
+        # Reverse index of WebSocket -> ClientState (which knows its
+        # account), so cleanup never has to search every account
+        self._clients: Dict[WebSocket, ClientState] = {}
+        # Number of registered connections across all accounts
+        self._total = 0
+        # Transactions waiting for the next batched broadcast, per account.
+        # An entry exists exactly while a flush is scheduled for it.
+        self._pending: Dict[str, List[dict]] = {}
+        # Background tasks (batched fan-outs, closes of dropped clients,
+        # cancelled writers) still running, kept referenced until done
+        self._tasks: Set[asyncio.Task] = set()
     
     async def connect(self, websocket: WebSocket, account_number: str) -> None:
         """
@@ -32,17 +139,20 @@ class ConnectionManager:
         """
         await websocket.accept()
         
-        async with self._lock:
-            if account_number not in self.active_connections:
-                self.active_connections[account_number] = set()
-            self.active_connections[account_number].add(websocket)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        
+        # Welcome message goes first, ahead of any transactions
+        queue.put_nowait(_welcome_frame(account_number))
         
-        # Send welcome message
-        await websocket.send_json({
-            "type": "connected",
-            "message": f"Connected to transaction updates for account {account_number}",
-            "account_number": account_number
-        })
+        writer = asyncio.create_task(self._writer(websocket, queue))
+        client = ClientState(websocket, account_number, queue, writer)
+        
+        subscribers = self.active_connections.get(account_number)
+        if subscribers is None:
+            subscribers = self.active_connections[account_number] = Subscribers()
+        subscribers.add(client)
+        self._clients[websocket] = client
+        self._total += 1
     
     async def disconnect(self, websocket: WebSocket, account_number: str) -> None:
         """
@@ -52,13 +162,85 @@ class ConnectionManager:
             websocket: The WebSocket connection to remove
             account_number: The account number to unsubscribe from
         """
-        async with self._lock:
-            if account_number in self.active_connections:
-                self.active_connections[account_number].discard(websocket)
-                
-                # Clean up empty sets
-                if not self.active_connections[account_number]:
-                    del self.active_connections[account_number]
+        self._remove(websocket)
+    
+    async def disconnect_ws(self, websocket: WebSocket) -> None:
+        """
+        Remove a WebSocket connection without knowing its account.
+        
+        Args:
+            websocket: The WebSocket connection to remove
+        """
+        self._remove(websocket)
+    
+    def _remove(self, websocket: WebSocket, close: bool = False) -> None:
+        """Unregister a connection and stop its writer task."""
+        client = self._clients.get(websocket)
+        if client is not None:
+            self._remove_from(client.account_number, (client,), close)
+    
+    def _remove_from(
+        self,
+        account_number: str,
+        clients: Iterable[ClientState],
+        close: bool = False
+    ) -> None:
+        """
+        Unregister clients of one account, looking its subscribers up only once.
+        
+        With close=True the manager is dropping clients the peer doesn't know
+        about yet (too slow, or a failed send), so their sockets are closed
+        too. This runs synchronously, so each close is scheduled as a task.
+        """
+        subscribers = self.active_connections.get(account_number)
+        if subscribers is None:
+            return
+        
+        current = asyncio.current_task()
+        for client in clients:
+            # Skip clients already gone, e.g. from a stale fan-out snapshot
+            if not subscribers.discard(client):
+                continue
+            del self._clients[client.websocket]
+            self._total -= 1
+            if client.writer is not current:
+                # Keep the writer referenced until it has processed the
+                # cancellation; nothing else points at it any more
+                client.writer.cancel()
+                self._track(client.writer)
+            if close:
+                self._spawn(self._close(client.websocket))
+        
+        # Clean up empty accounts
+        if not subscribers:
+            del self.active_connections[account_number]
+    
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue) -> None:
+        """Send queued frames to one client until it fails or is disconnected."""
+        try:
+            while True:
+                payload = await queue.get()
+                await asyncio.wait_for(websocket.send_bytes(payload), timeout=SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._remove(websocket, close=True)
+    
+    async def _close(self, websocket: WebSocket) -> None:
+        """Close a dropped client's socket, ignoring one that is already gone."""
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(
+                websocket.close(code=DROPPED_CLIENT_CLOSE_CODE), timeout=SEND_TIMEOUT
+            )
+    
+    def _spawn(self, coro) -> None:
+        """Run a background task, keeping it referenced until it finishes."""
+        self._track(asyncio.create_task(coro))
+    
+    def _track(self, task: asyncio.Task) -> None:
+        """Hold a reference to a task until it is done."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
     
     async def broadcast_transaction(
         self,
@@ -68,41 +250,112 @@ class ConnectionManager:
         """
         Broadcast a transaction notification to all connected clients for an account.
         
+        Transactions are held for BATCH_WINDOW seconds so a burst on one
+        account goes out as a single frame instead of one frame each.
+        
         Args:
             account_number: The account number to broadcast to
             transaction_data: The transaction data to send
         """
-        async with self._lock:
-            connections = self.active_connections.get(account_number, set()).copy()
+        # Accounts without subscribers have no entry at all, so this one
+        # membership test is the whole cost of the common case
+        if account_number not in self.active_connections:
+            return
+        
+        pending = self._pending.get(account_number)
+        if pending is None:
+            self._pending[account_number] = [transaction_data]
+            asyncio.get_running_loop().call_later(BATCH_WINDOW, self._flush, account_number)
+        else:
+            pending.append(transaction_data)
+    
+    def _flush(self, account_number: str) -> None:
+        """Send an account's buffered transactions to its subscribers."""
+        transactions = self._pending.pop(account_number, None)
+        subscribers = self.active_connections.get(account_number)
         
-        if not connections:
+        if not transactions or not subscribers:
             return
         
-        message = {
-            "type": "transaction",
-            "data": transaction_data
-        }
+        # Serialize once; every subscriber gets the same binary frame
+        if len(transactions) == 1:
+            payload = orjson.dumps({
+                "type": "transaction",
+                "data": transactions[0]
+            })
+        else:
+            payload = orjson.dumps({
+                "type": "transactions",
+                "data": transactions
+            })
         
-        disconnected = []
-        for websocket in connections:
+        if len(subscribers) <= BROADCAST_BATCH_SIZE:
+            self._enqueue(account_number, payload, subscribers.clients)
+            return
+        
+        # Large fan-outs hand the loop back between batches so other
+        # requests aren't stalled behind thousands of enqueues
+        self._spawn(
+            self._enqueue_in_batches(account_number, payload, tuple(subscribers.clients))
+        )
+    
+    def _enqueue(
+        self,
+        account_number: str,
+        payload: bytes,
+        clients: Iterable[Optional[ClientState]]
+    ) -> None:
+        """Queue a frame for each subscriber, dropping any that are too far behind."""
+        # Nothing here awaits, so clients can be the live subscriber list;
+        # slow clients are removed only after the loop finishes
+        slow = []
+        for client in clients:
+            if client is None:
+                continue
             try:
-                await websocket.send_json(message)
-            except Exception:
-                disconnected.append(websocket)
+                client.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                slow.append(client)
         
-        if disconnected:
-            async with self._lock:
-                for ws in disconnected:
-                    if account_number in self.active_connections:
-                        self.active_connections[account_number].discard(ws)
+        # Clients that let their queue fill up are dropped rather than
+        # buffered without bound
+        if slow:
+            self._remove_from(account_number, slow, close=True)
+    
+    async def _enqueue_in_batches(
+        self,
+        account_number: str,
+        payload: bytes,
+        clients: Tuple[Optional[ClientState], ...]
+    ) -> None:
+        """Queue a frame for a snapshot of subscribers, yielding between batches."""
+        for start in range(0, len(clients), BROADCAST_BATCH_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            self._enqueue(account_number, payload, clients[start:start + BROADCAST_BATCH_SIZE])
+    
+    def has_subscribers(self, account_number: str) -> bool:
+        """Check whether any client is subscribed to an account; safe from any thread."""
+        return account_number in self.active_connections
     
     def get_connection_count(self, account_number: str) -> int:
         """Get the number of active connections for an account."""
-        return len(self.active_connections.get(account_number, set()))
+        return len(self.active_connections.get(account_number, ()))
     
     def get_total_connections(self) -> int:
         """Get the total number of active connections."""
-        return sum(len(conns) for conns in self.active_connections.values())
+        if CHECK_CONNECTION_COUNTS:
+            self._check_total()
+        return self._total
+    
+    def _check_total(self) -> None:
+        """Report if the running total has drifted from the registry."""
+        actual = sum(
+            len(subs.clients) - subs.clients.count(None)
+            for subs in self.active_connections.values()
+        )
+        if actual != self._total:
+            print(f"WebSocket connection count drifted: counter {self._total}, actual {actual}")
 
 
 # Global connection manager instance